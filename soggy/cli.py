@@ -2,34 +2,36 @@
 
 import argparse
 import logging
+import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
 from soggy.markdown import render_markdown
-from soggy.minify import minify_html_text, minify_text_for_path, should_minify_path
+from soggy.markdown_cache import CACHE_DIR_NAME
+from soggy.minify import minify_bytes_for_path, minify_html_bytes, should_minify_path
 from soggy.templates import IndexEntry, TemplateRenderer
-from soggy.vault import VaultMarkdown, load_vault
+from soggy.vault import VaultFile, VaultMarkdown, clear_created_dirs, load_vault
 
 
 DEFAULT_SITE_TITLE = "Kevin Stock"
+_STATIC_ROOT = Path(__file__).resolve().parent.parent / "static"
+# Below this many files the pool setup costs more than the overlapped writes save.
+_MIN_PARALLEL_WRITES = 8
 _LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 _LOG_LEVEL_MAP = {name: getattr(logging, name) for name in _LOG_LEVELS}
+_QUIET_LEVELS = {1: logging.ERROR, 2: logging.CRITICAL}
 _LOGGER = logging.getLogger(__name__)
 
 
 def _resolve_log_level(log_level: str | None, verbose: int, quiet: int) -> int:
     if log_level:
         return _LOG_LEVEL_MAP[log_level]
-
-    level = logging.WARNING
-    if verbose:
-        level = logging.DEBUG
-    if quiet == 1:
-        level = logging.ERROR
-    elif quiet >= 2:
-        level = logging.CRITICAL
-    return level
+    if quiet:
+        return _QUIET_LEVELS[min(quiet, 2)]
+    return logging.DEBUG if verbose else logging.WARNING
 
 
 def _configure_logging(level: int) -> None:
@@ -63,6 +65,11 @@ def _parse_args() -> argparse.Namespace:
         default=DEFAULT_SITE_TITLE,
         help="Title to use for the generated site.",
     )
+    parser.add_argument(
+        "--clean-cache",
+        action="store_true",
+        help="Delete the render cache in the input directory before building.",
+    )
     parser.add_argument(
         "--log-level",
         choices=_LOG_LEVELS,
@@ -87,25 +94,23 @@ def _parse_args() -> argparse.Namespace:
 
 def _normalize_ignore_output_paths(
     output_dir: Path, ignore_output: list[str]
-) -> list[Path]:
-    output_root = output_dir.resolve(strict=False)
-    normalized: list[Path] = []
+) -> set[str]:
+    normalized: set[str] = set()
     for raw in ignore_output:
-        resolved = (output_root / Path(raw)).resolve(strict=False)
-        if resolved.parent != output_root:
+        path = Path(raw)
+        if path.is_absolute() or path.parent != Path(".") or path.name in {"", ".."}:
             raise ValueError(
                 "Ignore output path must be a top-level entry within "
                 f"{output_dir.as_posix()}: {raw}"
             )
-        normalized.append(resolved)
+        normalized.add(path.name)
     return normalized
 
 
 def _clear_directory(output_dir: Path, ignore_output: list[str]) -> None:
-    ignore_paths = _normalize_ignore_output_paths(output_dir, ignore_output)
-    ignore_set = {path.resolve(strict=False) for path in ignore_paths}
+    ignore_names = _normalize_ignore_output_paths(output_dir, ignore_output)
     for item in output_dir.iterdir():
-        if item.resolve(strict=False) in ignore_set:
+        if item.name in ignore_names:
             continue
         if item.is_dir() and not item.is_symlink():
             shutil.rmtree(item)
@@ -126,6 +131,7 @@ def _prepare_output_dir(
                 f"Output path exists but is not a directory: {output_dir}"
             )
         _clear_directory(output_dir, ignore_output)
+        clear_created_dirs()
     output_dir.mkdir(parents=True, exist_ok=True)
     _LOGGER.info("Prepared output directory: %s", output_dir.as_posix())
 
@@ -133,37 +139,58 @@ def _prepare_output_dir(
 def _validate_output_dir(input_dir: Path, output_dir: Path) -> None:
     input_root = input_dir.resolve()
     output_root = output_dir.resolve()
-    if (
-        output_root == input_root
-        or output_root.is_relative_to(input_root)
-        or input_root.is_relative_to(output_root)
-    ):
+    common = os.path.commonpath([input_root, output_root])
+    if common in (str(input_root), str(output_root)):
         raise ValueError(
             "Output directory must not be the same as or nested within the input directory."
         )
 
 
+def _walk_files(root: Path) -> Iterator[Path]:
+    for entry in os.scandir(root):
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk_files(Path(entry.path))
+        elif entry.is_file(follow_symlinks=False):
+            yield Path(entry.path)
+
+
+def _copy_static_one(path: Path, destination: Path) -> None:
+    if should_minify_path(path):
+        destination.write_bytes(minify_bytes_for_path(path, path.read_bytes()))
+    else:
+        shutil.copy2(path, destination)
+
+
 def _copy_static_files(output_dir: Path) -> None:
-    static_root = Path(__file__).resolve().parent.parent / "static"
-    if not static_root.is_dir():
-        raise FileNotFoundError(f"Static directory not found: {static_root}")
+    if not _STATIC_ROOT.is_dir():
+        raise FileNotFoundError(f"Static directory not found: {_STATIC_ROOT}")
     destination_root = output_dir / "static"
-    for path in sorted(static_root.rglob("*"), key=lambda item: item.as_posix()):
-        if path.is_dir():
-            continue
-        rel_path = path.relative_to(static_root)
-        destination = destination_root / rel_path
+    pairs = [
+        (path, destination_root / path.relative_to(_STATIC_ROOT))
+        for path in _walk_files(_STATIC_ROOT)
+    ]
+    for _, destination in pairs:
         destination.parent.mkdir(parents=True, exist_ok=True)
-        if should_minify_path(path):
-            content = path.read_text(encoding="utf-8")
-            destination.write_text(
-                minify_text_for_path(path, content), encoding="utf-8"
-            )
-        else:
-            shutil.copy2(path, destination)
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for _ in executor.map(lambda pair: _copy_static_one(*pair), pairs):
+            pass
     _LOGGER.info("Copied static assets to %s", destination_root.as_posix())
 
 
+def _write_outputs(files: list[VaultFile], input_dir: Path, output_dir: Path) -> None:
+    if len(files) < _MIN_PARALLEL_WRITES:
+        for file in files:
+            file.write_out(input_dir, output_dir)
+        return
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for _ in executor.map(
+            lambda file: file.write_out(input_dir, output_dir), files
+        ):
+            pass
+
+
 def _write_index(
     files: list[VaultMarkdown], output_dir: Path, renderer: TemplateRenderer
 ) -> None:
@@ -178,9 +205,8 @@ def _write_index(
     index_path = output_dir / "index.html"
     if index_path.exists():
         raise FileExistsError(f"Output file already exists: {index_path}")
-    index_path.write_text(
-        minify_html_text(renderer.render_index(entries)),
-        encoding="utf-8",
+    index_path.write_bytes(
+        minify_html_bytes(renderer.render_index(entries).encode("utf-8"))
     )
     _LOGGER.info("Wrote index: %s", index_path.as_posix())
 
@@ -192,11 +218,16 @@ def build_site(
     overwrite: bool = False,
     ignore_output: list[str] | None = None,
     site_title: str = DEFAULT_SITE_TITLE,
+    clean_cache: bool = False,
 ) -> None:
     if ignore_output is None:
         ignore_output = []
     _validate_output_dir(input_dir, output_dir)
     _prepare_output_dir(output_dir, overwrite, ignore_output)
+    cache_dir = input_dir / CACHE_DIR_NAME
+    if clean_cache and cache_dir.is_dir():
+        shutil.rmtree(cache_dir)
+        _LOGGER.info("Cleared render cache: %s", cache_dir.as_posix())
     _LOGGER.info(
         "Building site from %s to %s",
         input_dir.as_posix(),
@@ -204,9 +235,8 @@ def build_site(
     )
     files = load_vault(input_dir)
     renderer = TemplateRenderer(site_title)
-    render_markdown(files, renderer)
-    for file in files:
-        file.write_out(input_dir, output_dir)
+    render_markdown(files, renderer, cache_dir=cache_dir)
+    _write_outputs(files, input_dir, output_dir)
     _copy_static_files(output_dir)
     published_posts = [
         file for file in files if isinstance(file, VaultMarkdown) and file.publish
@@ -227,6 +257,7 @@ def main() -> None:
             overwrite=args.overwrite,
             ignore_output=args.ignore_output,
             site_title=args.site_title,
+            clean_cache=args.clean_cache,
         )
     except (FileExistsError, NotADirectoryError) as exc:
         print(exc, file=sys.stderr)
@@ -1,23 +1,31 @@
 from __future__ import annotations
 
-from pathlib import PurePosixPath
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from typing import Match, Sequence, cast
 from urllib.parse import unquote, urlparse
 
 import logging
+import os
+import re
 
 from mistune import HTMLRenderer, Markdown, create_markdown
 from mistune.core import InlineState
 from mistune.inline_parser import InlineParser
 from mistune.util import escape_url
 
+from soggy.markdown_cache import cache_key, load_cached, store_cached, vault_fingerprint
 from soggy.vault import VaultFile, VaultMarkdown
 from soggy.templates import TemplateRenderer
 
-_WIKILINK_PATTERN = r"\[\[(?P<page>[^|\]]+)(?:\|(?P<display>[^\]]+))?\]\]"
+_WIKILINK_RE = re.compile(r"\[\[(?P<page>[^|\]]+)(?:\|(?P<display>[^\]]+))?\]\]")
 _LOGGER = logging.getLogger(__name__)
-_INLINE_COMMENT_PATTERN = r"%%.+?%%"
-_BLOCK_COMMENT_PATTERN = r"^ {0,3}%%[ \t]*\n[\s\S]+?\n%%[ \t]*$"
+_INLINE_COMMENT_RE = re.compile(r"%%.+?%%")
+_BLOCK_COMMENT_RE = re.compile(r"^ {0,3}%%[ \t]*\n[\s\S]+?\n%%[ \t]*$")
+
+# Below this many publishable files the pool spawn cost outweighs the
+# parallel speedup, so render on the main process instead.
+_MIN_PARALLEL_FILES = 4
 
 
 class SoggyRenderer(HTMLRenderer):
@@ -26,15 +34,38 @@ class SoggyRenderer(HTMLRenderer):
         files: Sequence[VaultFile],
     ) -> None:
         super().__init__()
-        self._files = files
+        self._files = tuple(files)
+        self._targeted: list[str] = []
+        self._resolve_cache: dict[str, tuple[str, VaultFile | None]] = {}
+        url_index: dict[str, list[VaultFile]] = {}
+        for file in files:
+            for key in file.url_keys():
+                url_index.setdefault(key, []).append(file)
+        self._url_index = url_index
+
+    def reset_targeted(self) -> None:
+        self._targeted = []
+
+    @property
+    def targeted(self) -> list[str]:
+        return list(self._targeted)
 
     def _match_files(self, path: str) -> list[VaultFile]:
-        return [file for file in self._files if file.matches_url(path)]
+        return self._url_index.get(path.lower(), [])
 
     def _resolve_url(self, url: str) -> str:
+        cached = self._resolve_cache.get(url)
+        if cached is not None:
+            resolved, selected = cached
+            if selected is not None:
+                selected.target()
+                self._targeted.append(selected.path.as_posix())
+            return resolved
+
         parsed = urlparse(url)
 
         if parsed.scheme or parsed.netloc:
+            self._resolve_cache[url] = (url, None)
             return url
 
         if parsed.params or parsed.query:
@@ -61,6 +92,7 @@ class SoggyRenderer(HTMLRenderer):
 
         selected = next(iter(matches.values()))
         selected.target()
+        self._targeted.append(selected.path.as_posix())
         _LOGGER.debug(
             "Resolved internal link %s -> %s",
             decoded_path,
@@ -69,7 +101,9 @@ class SoggyRenderer(HTMLRenderer):
         resolved_path = selected.output_path.as_posix()
         if not resolved_path.startswith("/"):
             resolved_path = f"/{resolved_path}"
-        return escape_url(resolved_path)
+        resolved = escape_url(resolved_path)
+        self._resolve_cache[url] = (resolved, selected)
+        return resolved
 
     def link(self, text: str, url: str, title: str | None = None) -> str:
         resolved = self._resolve_url(url)
@@ -86,7 +120,7 @@ def parse_wikilink(inline: InlineParser, m: Match[str], state: InlineState) -> i
     text = display.strip() if display is not None else page_title
 
     url = page_title
-    if PurePosixPath(url).suffix.lower() != ".md":
+    if not url.lower().endswith(".md"):
         url = f"{url}.md"
 
     state.append_token(
@@ -100,7 +134,7 @@ def parse_wikilink(inline: InlineParser, m: Match[str], state: InlineState) -> i
 
 
 def wikilink_plugin(md: Markdown) -> None:
-    md.inline.register("wikilink", _WIKILINK_PATTERN, parse_wikilink, before="link")
+    md.inline.register("wikilink", _WIKILINK_RE.pattern, parse_wikilink, before="link")
 
 
 def parse_inline_comment(
@@ -116,29 +150,69 @@ def parse_block_comment(block: object, m: Match[str], state: object) -> int:
 def comment_plugin(md: Markdown) -> None:
     md.block.register(
         "comment",
-        _BLOCK_COMMENT_PATTERN,
+        _BLOCK_COMMENT_RE.pattern,
         parse_block_comment,
         before="paragraph",
     )
     md.inline.register(
         "comment",
-        _INLINE_COMMENT_PATTERN,
+        _INLINE_COMMENT_RE.pattern,
         parse_inline_comment,
         before="link",
     )
 
 
-def render_markdown(files: Sequence[VaultFile], renderer: TemplateRenderer) -> None:
-    for file in files:
-        if not isinstance(file, VaultMarkdown) or not file.publish:
-            continue
-        _LOGGER.info("Rendering markdown: %s", file.path.as_posix())
-        md_renderer = SoggyRenderer(files)
-        markdown = create_markdown(
-            renderer=md_renderer,
-            plugins=["mark", "task_lists", "def_list", comment_plugin, wikilink_plugin],
-        )
-        body_html = cast(str, markdown(file.content))
+def _build_markdown(files: Sequence[VaultFile]) -> tuple[Markdown, SoggyRenderer]:
+    md_renderer = SoggyRenderer(files)
+    markdown = create_markdown(
+        renderer=md_renderer,
+        plugins=["mark", "task_lists", "def_list", comment_plugin, wikilink_plugin],
+    )
+    return markdown, md_renderer
+
+
+def _render_body(
+    markdown: Markdown, md_renderer: SoggyRenderer, file: VaultMarkdown
+) -> tuple[str, list[str]]:
+    md_renderer.reset_targeted()
+    body_html = cast(str, markdown(file.content))
+    return body_html, md_renderer.targeted
+
+
+_WORKER_STATE: tuple[Markdown, SoggyRenderer] | None = None
+
+
+def _init_worker(files: Sequence[VaultFile]) -> None:
+    global _WORKER_STATE
+    _WORKER_STATE = _build_markdown(files)
+
+
+def _render_one(file: VaultMarkdown) -> tuple[str, str, list[str]]:
+    """Render one file's body and report which vault files its links targeted.
+
+    Runs in a worker process, so the targeted flags set during link
+    resolution are collected and returned for replay on the main process.
+    """
+    if _WORKER_STATE is None:
+        raise RuntimeError("Render worker is not initialized.")
+    markdown, md_renderer = _WORKER_STATE
+    body_html, targeted = _render_body(markdown, md_renderer, file)
+    return file.path.as_posix(), body_html, targeted
+
+
+def render_markdown(
+    files: Sequence[VaultFile],
+    renderer: TemplateRenderer,
+    cache_dir: Path | None = None,
+) -> None:
+    publishable = [
+        file for file in files if isinstance(file, VaultMarkdown) and file.publish
+    ]
+    by_path = {file.path.as_posix(): file for file in files}
+
+    def apply(file: VaultMarkdown, body_html: str, targeted: list[str]) -> None:
+        for target_path in targeted:
+            by_path[target_path].target()
         file.set_html(
             renderer.render_page(
                 file.title,
@@ -148,3 +222,45 @@ def render_markdown(files: Sequence[VaultFile], renderer: TemplateRenderer) -> N
                 show_created_date="hide-created-date" not in file.tags,
             )
         )
+
+    fingerprint = vault_fingerprint(files) if cache_dir is not None else b""
+    keys: dict[str, str] = {}
+    pending: list[VaultMarkdown] = []
+    for file in publishable:
+        if cache_dir is None:
+            pending.append(file)
+            continue
+        key = cache_key(file.content, fingerprint)
+        keys[file.path.as_posix()] = key
+        cached = load_cached(cache_dir, key)
+        if cached is None:
+            pending.append(file)
+            continue
+        _LOGGER.info("Markdown cache hit: %s", file.path.as_posix())
+        apply(file, cached[0], cached[1])
+
+    def store_and_apply(path: str, body_html: str, targeted: list[str]) -> None:
+        if cache_dir is not None:
+            store_cached(cache_dir, keys[path], body_html, targeted)
+        apply(cast(VaultMarkdown, by_path[path]), body_html, targeted)
+
+    if len(pending) < _MIN_PARALLEL_FILES:
+        markdown, md_renderer = _build_markdown(files)
+        for file in pending:
+            _LOGGER.info("Rendering markdown: %s", file.path.as_posix())
+            body_html, targeted = _render_body(markdown, md_renderer, file)
+            store_and_apply(file.path.as_posix(), body_html, targeted)
+        return
+
+    cpu_count = os.cpu_count() or 1
+    chunksize = max(1, len(pending) // (4 * cpu_count))
+    with ProcessPoolExecutor(
+        max_workers=cpu_count,
+        initializer=_init_worker,
+        initargs=(files,),
+    ) as executor:
+        for path, body_html, targeted in executor.map(
+            _render_one, pending, chunksize=chunksize
+        ):
+            _LOGGER.info("Rendered markdown: %s", path)
+            store_and_apply(path, body_html, targeted)
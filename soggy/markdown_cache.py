@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Sequence
+
+from soggy.vault import VaultFile, VaultMarkdown
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bump to invalidate cached HTML when rendering behaviour changes
+# (plugin set, renderer output, cache entry format).
+_CACHE_VERSION = b"1"
+
+CACHE_DIR_NAME = ".soggy-cache"
+
+
+def vault_fingerprint(files: Sequence[VaultFile]) -> bytes:
+    """Summarize everything about the vault that affects link resolution.
+
+    Any change to the set of vault paths or to a file's output location
+    (permalink or publish state) must invalidate cached renders, since the
+    resolved hrefs baked into the HTML would differ.
+    """
+    entries = []
+    for file in files:
+        if isinstance(file, VaultMarkdown) and not file.publish:
+            output = "!unpublished"
+        else:
+            output = file.output_path.as_posix()
+        entries.append(f"{file.path.as_posix()}\x00{output}")
+    entries.sort()
+    return "\x01".join(entries).encode("utf-8")
+
+
+def cache_key(body: str, fingerprint: bytes) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(body.encode("utf-8"))
+    hasher.update(b"|")
+    hasher.update(fingerprint)
+    hasher.update(b"|")
+    hasher.update(_CACHE_VERSION)
+    return hasher.hexdigest()
+
+
+def _entry_path(cache_dir: Path, key: str) -> Path:
+    return cache_dir / "md" / f"{key}.json"
+
+
+def load_cached(cache_dir: Path, key: str) -> tuple[str, list[str]] | None:
+    """Return the cached (body html, targeted paths) for key, or None."""
+    entry_path = _entry_path(cache_dir, key)
+    try:
+        entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        return entry["html"], list(entry["targets"])
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        _LOGGER.warning("Discarding unreadable cache entry: %s", entry_path)
+        return None
+
+
+def store_cached(cache_dir: Path, key: str, html: str, targets: list[str]) -> None:
+    entry_path = _entry_path(cache_dir, key)
+    entry_path.parent.mkdir(parents=True, exist_ok=True)
+    entry_path.write_text(
+        json.dumps({"html": html, "targets": targets}), encoding="utf-8"
+    )
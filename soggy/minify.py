@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import logging
 from pathlib import Path, PurePosixPath
 
@@ -11,9 +12,14 @@ _MINIFY_SUFFIXES = {".html", ".htm", ".css"}
 
 
 def should_minify_path(path: Path | PurePosixPath) -> bool:
-    return path.suffix.lower() in _MINIFY_SUFFIXES
+    suffix = path.suffix
+    return (suffix if suffix.islower() else suffix.lower()) in _MINIFY_SUFFIXES
 
 
+# Pages share rendered boilerplate and stylesheets repeat verbatim, so
+# identical inputs recur within a build; memoizing skips the native
+# minifier for repeats.
+@functools.lru_cache(maxsize=1024)
 def minify_html_text(html: str) -> str:
     try:
         return minify_html.minify(html, minify_css=True, minify_js=True)
@@ -22,6 +28,7 @@ def minify_html_text(html: str) -> str:
         return html
 
 
+@functools.lru_cache(maxsize=1024)
 def minify_css_text(css: str) -> str:
     wrapped = f"<style>{css}</style>"
     try:
@@ -51,3 +58,18 @@ def minify_text_for_path(path: Path | PurePosixPath, content: str) -> str:
     if suffix == ".css":
         return minify_css_text(content)
     return content
+
+
+def minify_html_bytes(html: bytes) -> bytes:
+    # minify_html only takes str, so decode once here; callers working in
+    # bytes still skip the TextIOWrapper layers on read and write.
+    return minify_html_text(html.decode("utf-8")).encode("utf-8")
+
+
+def minify_bytes_for_path(path: Path | PurePosixPath, content: bytes) -> bytes:
+    suffix = path.suffix.lower()
+    if suffix in {".html", ".htm"}:
+        return minify_html_bytes(content)
+    if suffix == ".css":
+        return minify_css_text(content.decode("utf-8")).encode("utf-8")
+    return content
@@ -3,12 +3,34 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
-from typing import Iterable
+from typing import Sequence
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
 
+_TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
 
-@dataclass(frozen=True)
+_MONTHS = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+
+
+@dataclass(frozen=True, slots=True)
 class IndexEntry:
     title: str
     link: str
@@ -17,14 +39,18 @@ class IndexEntry:
 class TemplateRenderer:
     def __init__(self, site_title: str) -> None:
         self._site_title = site_title
-        templates_dir = Path(__file__).resolve().parent / "templates"
+        bytecode_dir = Path.home() / ".cache" / "soggy" / "jinja"
+        bytecode_dir.mkdir(parents=True, exist_ok=True)
         self._env = Environment(
-            loader=FileSystemLoader(templates_dir),
+            loader=FileSystemLoader(_TEMPLATES_DIR),
             autoescape=select_autoescape(["html", "xml"]),
+            bytecode_cache=FileSystemBytecodeCache(str(bytecode_dir)),
         )
+        self._page_template = self._env.get_template("page.html")
+        self._index_template = self._env.get_template("index.html")
 
     def _format_human_date(self, value: date) -> str:
-        return f"{value:%B} {value:%Y}"
+        return f"{_MONTHS[value.month - 1]} {value.year}"
 
     def render_page(
         self,
@@ -34,8 +60,7 @@ class TemplateRenderer:
         date_updated: date,
         show_created_date: bool = True,
     ) -> str:
-        template = self._env.get_template("page.html")
-        return template.render(
+        return self._page_template.render(
             page_title=title,
             site_title=self._site_title,
             created_iso=date_created.isoformat(),
@@ -46,16 +71,9 @@ class TemplateRenderer:
             body=body_html,
         )
 
-    def render_index(self, entries: Iterable[IndexEntry]) -> str:
-        template = self._env.get_template("index.html")
-        return template.render(
+    def render_index(self, entries: Sequence[IndexEntry]) -> str:
+        return self._index_template.render(
             page_title="Home",
             site_title=self._site_title,
-            posts=[
-                {
-                    "title": entry.title,
-                    "link": entry.link,
-                }
-                for entry in entries
-            ],
+            posts=entries,
         )
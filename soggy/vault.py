@@ -1,21 +1,91 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-import difflib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date, datetime
+from itertools import repeat
 from pathlib import Path, PurePosixPath
+from typing import Iterator
+import functools
 import logging
+import os
+import pickle
 import re
 import shutil
+import sys
+import threading
 
 import yaml
 
-from soggy.minify import minify_html_text, minify_text_for_path, should_minify_path
+from soggy.minify import minify_bytes_for_path, minify_html_bytes, should_minify_path
 
 _UNSAFE_URL_CHARS = re.compile(r"[^A-Za-z0-9/_\-.]")
 _LOGGER = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed loader/dumper when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Below this many markdown files, constructing them in-process beats pool startup.
+_MIN_PARALLEL_LOAD = 16
+
+# Directory trees that never contribute vault files.
+_SKIP_NAMES = {".git", ".obsidian", ".soggy-cache"}
+
+# Parsed front matter cached across runs, keyed by vault-relative path with
+# (st_mtime_ns, st_size) guarding staleness. Bump the version to invalidate
+# when the entry format or parsing behaviour changes.
+_FM_CACHE_VERSION = 1
+_FM_CACHE_NAME = "front-matter.pickle"
+_FmCacheEntry = tuple[tuple[int, int], dict[str, object], int]
+_FM_CACHE: dict[str, _FmCacheEntry] | None = None
+
+
+def _fm_cache_path(root: Path) -> Path:
+    return root / ".soggy-cache" / _FM_CACHE_NAME
+
+
+def _load_fm_cache(root: Path) -> dict[str, _FmCacheEntry]:
+    cache_path = _fm_cache_path(root)
+    try:
+        with open(cache_path, "rb") as handle:
+            version, entries = pickle.load(handle)
+    except FileNotFoundError:
+        return {}
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        _LOGGER.warning("Discarding unreadable front matter cache: %s", cache_path)
+        return {}
+    if version != _FM_CACHE_VERSION:
+        return {}
+    return entries
+
+
+def _store_fm_cache(root: Path, entries: dict[str, _FmCacheEntry]) -> None:
+    cache_path = _fm_cache_path(root)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "wb") as handle:
+            pickle.dump(
+                (_FM_CACHE_VERSION, entries), handle, protocol=pickle.HIGHEST_PROTOCOL
+            )
+    except OSError as exc:
+        _LOGGER.warning("Could not write front matter cache: %s", exc)
+
+
+def _scan_files(directory: str, prefix: str) -> Iterator[str]:
+    """Yield vault-relative posix paths of files, pruning skipped subtrees."""
+    for entry in os.scandir(directory):
+        if entry.name in _SKIP_NAMES:
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            yield from _scan_files(entry.path, f"{prefix}{entry.name}/")
+        elif entry.is_file():
+            yield f"{prefix}{entry.name}"
+
+
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
 
 def _parse_front_matter_date(value: object, field_name: str) -> date:
     if isinstance(value, date) and not isinstance(value, datetime):
@@ -23,70 +93,237 @@ def _parse_front_matter_date(value: object, field_name: str) -> date:
     if isinstance(value, datetime):
         return value.date()
     if isinstance(value, str):
+        # Validate the YYYY-MM-DD shape up front so malformed strings are
+        # rejected without raising and catching inside fromisoformat; the
+        # remaining try only guards out-of-range components.
+        if not _ISO_DATE_RE.fullmatch(value):
+            raise ValueError(f"Invalid {field_name}: {value}")
         try:
-            return date.fromisoformat(value)
+            return date(int(value[:4]), int(value[5:7]), int(value[8:10]))
         except ValueError as exc:
             raise ValueError(f"Invalid {field_name}: {value}") from exc
     raise ValueError(f"Missing or invalid {field_name}: {value!r}")
 
 
-def _sanitize_output_path(path: Path | PurePosixPath) -> PurePosixPath:
-    safe = path.as_posix().replace(" ", "_")
-    return PurePosixPath(_UNSAFE_URL_CHARS.sub("_", safe))
+_HEADER_CHUNK_SIZE = 8192
+
+
+def _read_text_fast(path: Path, offset: int = 0) -> str:
+    """Read a file from offset with one open/fstat/read, skipping the io stack.
 
+    Small markdown files fit in a single os.read, so this avoids the
+    BufferedReader/TextIOWrapper layers Path.read_text builds per call.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        remaining = os.fstat(fd).st_size - offset
+        if offset:
+            os.lseek(fd, offset, os.SEEK_SET)
+        data = os.read(fd, remaining)
+        while len(data) < remaining:
+            chunk = os.read(fd, remaining - len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    return data.decode("utf-8")
+
+
+def _read_front_matter(path: Path) -> tuple[str, int]:
+    """Return the raw front matter of path and the byte offset of the body.
+
+    Reads in chunks only until the closing delimiter so large bodies are
+    never pulled into memory just to parse a few lines of YAML.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, _HEADER_CHUNK_SIZE)
+        if not data.startswith(b"---"):
+            raise ValueError("Missing front matter.")
+        end = data.find(b"---", 3)
+        while end < 0:
+            chunk = os.read(fd, _HEADER_CHUNK_SIZE)
+            if not chunk:
+                raise ValueError("Missing closing front matter delimiter.")
+            # The delimiter may straddle the chunk boundary.
+            search_from = max(3, len(data) - 2)
+            data += chunk
+            end = data.find(b"---", search_from)
+    finally:
+        os.close(fd)
+    return data[3:end].decode("utf-8"), end + 3
+
+
+# Parent directories already created by this process's writers. write_out
+# runs under a thread pool, so membership updates take the lock; the mkdir
+# itself is outside it and idempotent.
+_created_dirs: set[str] = set()
+_created_dirs_lock = threading.Lock()
+
+
+def _ensure_parent_dir(destination: Path) -> None:
+    parent = str(destination.parent)
+    with _created_dirs_lock:
+        if parent in _created_dirs:
+            return
+    os.makedirs(parent, exist_ok=True)
+    with _created_dirs_lock:
+        _created_dirs.add(parent)
 
-def update_front_matter(source_path: Path, meta: dict[str, object], body: str) -> None:
-    rendered = yaml.safe_dump(meta, sort_keys=True).strip()
-    updated_content = f"---\n{rendered}\n---{body}"
-    original_content = source_path.read_text(encoding="utf-8")
 
-    if not original_content.startswith("---"):
-        raise ValueError("Missing front matter.")
+def clear_created_dirs() -> None:
+    """Forget created directories; call after the output tree is cleared."""
+    with _created_dirs_lock:
+        _created_dirs.clear()
 
+
+def _open_new_file(destination: Path) -> int:
+    """Open destination for writing, failing atomically if it exists.
+
+    O_EXCL folds the existence check into the create, so no separate
+    stat is needed and concurrent writers cannot race past the check.
+    """
     try:
-        _, front, _ = original_content.split("---", 2)
-    except ValueError as exc:
-        raise ValueError("Missing closing front matter delimiter.") from exc
-
-    original_meta = yaml.safe_load(front) or {}
-    if not isinstance(original_meta, dict):
-        raise ValueError("Invalid front matter.")
-
-    baseline_rendered = yaml.safe_dump(original_meta, sort_keys=True).strip()
-    baseline_content = f"---\n{baseline_rendered}\n---{body}"
-    baseline_lines = baseline_content.splitlines()
-    updated_lines = updated_content.splitlines()
-    matcher = difflib.SequenceMatcher(a=baseline_lines, b=updated_lines)
-    changes = [op for op in matcher.get_opcodes() if op[0] != "equal"]
-
-    if not (
-        len(changes) == 1
-        and changes[0][0] == "insert"
-        and (changes[0][4] - changes[0][3]) == 1
-    ):
-        raise ValueError(
-            "Updating front matter must only add one line to the front matter."
-        )
+        return os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError:
+        raise FileExistsError(f"Output file already exists: {destination}") from None
+
+
+def _write_new_file(destination: Path, content: bytes) -> None:
+    # BufferedWriter retries short writes, which a bare os.write would not.
+    with os.fdopen(_open_new_file(destination), "wb") as handle:
+        handle.write(content)
+
+
+# Bound once at import; either syscall may be missing on other platforms.
+_COPY_FILE_RANGE = getattr(os, "copy_file_range", None)
+_SENDFILE = getattr(os, "sendfile", None)
 
-    expected_line = f"permalink: {meta.get('permalink')}"
-    if updated_lines[changes[0][3]] != expected_line:
-        raise ValueError("Updating front matter must only add the permalink line.")
 
-    source_path.write_text(updated_content, encoding="utf-8")
+def _copy_file(source: Path, destination: Path) -> None:
+    """Copy source to destination in kernel space where the OS allows it.
 
+    copy_file_range and sendfile move data without round-tripping each
+    byte through Python buffers; plain copyfileobj is the portable
+    fallback. Timestamps and mode are preserved as shutil.copy2 does.
+    """
+    src_fd = os.open(source, os.O_RDONLY)
+    try:
+        size = os.fstat(src_fd).st_size
+        dst_fd = _open_new_file(destination)
+        try:
+            remaining = size
+            if _COPY_FILE_RANGE is not None:
+                try:
+                    while remaining > 0:
+                        sent = _COPY_FILE_RANGE(src_fd, dst_fd, remaining)
+                        if sent == 0:
+                            break
+                        remaining -= sent
+                except OSError:
+                    # Cross-device or unsupported filesystem; fall through.
+                    pass
+            if remaining > 0 and _SENDFILE is not None:
+                try:
+                    while remaining > 0:
+                        sent = _SENDFILE(dst_fd, src_fd, size - remaining, remaining)
+                        if sent == 0:
+                            break
+                        remaining -= sent
+                except OSError:
+                    pass
+            if remaining > 0:
+                os.lseek(src_fd, size - remaining, os.SEEK_SET)
+                with (
+                    open(src_fd, "rb", closefd=False) as src,
+                    open(dst_fd, "wb", closefd=False) as dst,
+                ):
+                    shutil.copyfileobj(src, dst)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(source, destination)
+
+
+@functools.lru_cache(maxsize=4096)
+def _sanitize_output_path(path: Path | PurePosixPath) -> PurePosixPath:
+    # Space is outside the allowed class, so the single sub also maps it to "_".
+    return PurePosixPath(_UNSAFE_URL_CHARS.sub("_", path.as_posix()))
+
+
+def _splice_permalink(rendered: str, permalink_line: str) -> str:
+    """Insert a permalink line into sorted rendered front matter.
+
+    Top-level keys start in column zero; continuation lines of nested
+    values are indented, so comparing only unindented lines keeps the
+    insertion at the sorted position among the real keys.
+    """
+    lines = rendered.split("\n")
+    for index, line in enumerate(lines):
+        if line[:1] not in ("", " ", "\t") and line > permalink_line:
+            lines.insert(index, permalink_line)
+            break
+    else:
+        lines.append(permalink_line)
+    return "\n".join(lines)
+
+
+def update_front_matter(
+    source_path: Path,
+    meta: dict[str, object],
+    body: str,
+    original_meta: dict[str, object] | None = None,
+) -> None:
+    if original_meta is None:
+        front, _ = _read_front_matter(source_path)
+        original_meta = yaml.load(front, Loader=_YAML_LOADER) or {}
+        if not isinstance(original_meta, dict):
+            raise ValueError("Invalid front matter.")
+
+    if not original_meta:
+        raise ValueError("Cannot add a permalink to empty front matter.")
+
+    baseline_rendered = yaml.dump(
+        original_meta, Dumper=_YAML_DUMPER, sort_keys=True
+    ).strip()
+    if baseline_rendered.startswith(("{", "[")):
+        raise ValueError("Front matter did not render in block style.")
+
+    # Render only the one-line permalink mapping and splice it into the
+    # baseline dump, so the update adds the permalink line by construction
+    # instead of dumping the full meta a second time and diffing.
+    permalink_line = yaml.dump(
+        {"permalink": meta.get("permalink")}, Dumper=_YAML_DUMPER
+    ).strip()
+    rendered = _splice_permalink(baseline_rendered, permalink_line)
+
+    source_path.write_text(f"---\n{rendered}\n---{body}", encoding="utf-8")
 
-@dataclass
+
+@dataclass(slots=True)
 class VaultFile(ABC):
     path: PurePosixPath
+    _posix: str = field(init=False, repr=False)
+    _posix_lower: str = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         if type(self) is VaultFile:
             raise TypeError("VaultFile cannot be instantiated directly.")
+        self._posix = self.path.as_posix()
+        self._posix_lower = self._posix.lower()
 
     def matches_url(self, url: str) -> bool:
         if not url:
             return False
-        return self.path.as_posix().lower().endswith(url.lower())
+        return self._posix_lower.endswith(url.lower())
+
+    def url_keys(self) -> Iterator[str]:
+        """Every lowercased url that matches_url would accept for this file."""
+        posix = self._posix_lower
+        for start in range(len(posix)):
+            yield posix[start:]
 
     @property
     @abstractmethod
@@ -102,9 +339,8 @@ class VaultFile(ABC):
         raise NotImplementedError
 
 
-@dataclass(init=False)
+@dataclass(init=False, slots=True)
 class VaultMarkdown(VaultFile):
-    content: str
     publish: bool
     update_source: bool
     date_created: date
@@ -113,27 +349,34 @@ class VaultMarkdown(VaultFile):
     title: str
     html: str | None
     _output_path: PurePosixPath
+    _output_path_str: str
     _meta: dict[str, object]
     _missing_permalink: bool
     _permalink_value: str | None
+    _source_path: Path
+    _body_offset: int
+    _content: str | None
+    _stat_key: tuple[int, int]
 
     def __init__(self, path: PurePosixPath, root: Path) -> None:
         self.path = path
+        self.__post_init__()
         output_path = _sanitize_output_path(path.with_suffix(""))
         source_path = root / path
-        content = source_path.read_text(encoding="utf-8")
-
-        if not content.startswith("---"):
-            raise ValueError("Missing front matter.")
-
-        try:
-            _, front, self.content = content.split("---", 2)
-        except ValueError as exc:
-            raise ValueError("Missing closing front matter delimiter.") from exc
-
-        meta = yaml.safe_load(front) or {}
-        if not isinstance(meta, dict):
-            raise ValueError("Invalid front matter.")
+        status = os.stat(source_path)
+        stat_key = (status.st_mtime_ns, status.st_size)
+        cached = _FM_CACHE.get(self._posix) if _FM_CACHE is not None else None
+        if cached is not None and cached[0] == stat_key:
+            _, meta, body_offset = cached
+        else:
+            front, body_offset = _read_front_matter(source_path)
+            meta = yaml.load(front, Loader=_YAML_LOADER) or {}
+            if not isinstance(meta, dict):
+                raise ValueError("Invalid front matter.")
+        self._source_path = source_path
+        self._body_offset = body_offset
+        self._content = None
+        self._stat_key = stat_key
 
         _LOGGER.debug("Front matter meta for %s: %s", path.as_posix(), meta)
 
@@ -151,6 +394,8 @@ class VaultMarkdown(VaultFile):
         self._permalink_value = None
 
         if permalink := meta.get("permalink"):
+            if not isinstance(permalink, str):
+                raise ValueError(f"Invalid permalink: {permalink!r}")
             output_path = PurePosixPath(permalink)
             update_source = False
         else:
@@ -168,33 +413,43 @@ class VaultMarkdown(VaultFile):
         )
         self.html = None
         self._output_path = output_path
+        self._output_path_str = output_path.as_posix().lstrip("/")
 
     def update_permalink_source(self, root: Path) -> None:
         if not self.publish or not self._missing_permalink:
             return
-        permalink_value = self._permalink_value or self._output_path.as_posix().lstrip(
-            "/"
-        )
+        permalink_value = self._permalink_value or self._output_path_str
+        original_meta = dict(self._meta)
         self._meta["permalink"] = permalink_value
-        update_front_matter(root / self.path, self._meta, self.content)
+        update_front_matter(
+            root / self.path, self._meta, self.content, original_meta=original_meta
+        )
         _LOGGER.warning(
             "Missing permalink in front matter for %s; set to %s",
             self.path.as_posix(),
             permalink_value,
         )
 
+    @property
+    def content(self) -> str:
+        if self._content is None:
+            self._content = _read_text_fast(self._source_path, self._body_offset)
+        return self._content
+
     @staticmethod
     def _parse_tags(value: object) -> set[str]:
+        # Tag vocabularies repeat across notes, so interning shares one
+        # string per distinct tag and makes set lookups pointer-fast.
         if value is None:
             return set()
         if isinstance(value, str):
-            return {value}
+            return {sys.intern(value)}
         if isinstance(value, list):
             tags = set()
             for item in value:
                 if not isinstance(item, str):
                     raise ValueError(f"Invalid tag entry: {item!r}")
-                tags.add(item)
+                tags.add(sys.intern(item))
             return tags
         raise ValueError(f"Invalid tags: {value!r}")
 
@@ -216,17 +471,13 @@ class VaultMarkdown(VaultFile):
             return
         if self.html is None:
             raise ValueError("Published markdown is missing rendered html.")
-        destination = (
-            output_dir / self.output_path.as_posix().lstrip("/") / "index.html"
-        )
-        if destination.exists():
-            raise FileExistsError(f"Output file already exists: {destination}")
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        destination.write_text(minify_html_text(self.html), encoding="utf-8")
+        destination = output_dir / self._output_path_str / "index.html"
+        _ensure_parent_dir(destination)
+        _write_new_file(destination, minify_html_bytes(self.html.encode("utf-8")))
         _LOGGER.info("Wrote page: %s", destination.as_posix())
 
 
-@dataclass
+@dataclass(slots=True)
 class VaultOther(VaultFile):
     targeted: bool = False
 
@@ -241,38 +492,63 @@ class VaultOther(VaultFile):
         if not self.targeted:
             return
         source = root / self.path
-        destination = output_dir / self.output_path.as_posix().lstrip("/")
-        if destination.exists():
-            raise FileExistsError(f"Output file already exists: {destination}")
-        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination = output_dir / self._posix
+        _ensure_parent_dir(destination)
         if should_minify_path(self.path):
-            content = source.read_text(encoding="utf-8")
-            destination.write_text(
-                minify_text_for_path(self.path, content), encoding="utf-8"
+            _write_new_file(
+                destination, minify_bytes_for_path(self.path, source.read_bytes())
             )
         else:
-            shutil.copy2(source, destination)
+            _copy_file(source, destination)
         _LOGGER.info("Copied asset: %s", destination.as_posix())
 
 
-def load_vault(directory: Path | str) -> list[VaultFile]:
+def iter_vault(directory: Path | str) -> Iterator[VaultFile]:
+    """Yield vault files in sorted path order as they are constructed.
+
+    Markdown parsing happens lazily (or overlapped in the thread pool),
+    so consumers that short-circuit never pay for the rest of the vault.
+    The front matter cache is only re-stored once the walk completes.
+    """
     root = Path(directory)
     if not root.is_dir():
         raise NotADirectoryError(f"{root} is not a directory")
 
     _LOGGER.info("Loading vault: %s", root.as_posix())
-    files: list[VaultFile] = []
-    for path in sorted(root.rglob("*"), key=lambda item: item.as_posix()):
-        if not path.is_file():
-            continue
-        if {".git", ".obsidian"}.intersection(path.parts):
-            continue
-        rel_path = PurePosixPath(path.relative_to(root).as_posix())
-        _LOGGER.info("Processing file: %s", rel_path.as_posix())
-        if path.suffix.lower() == ".md":
-            files.append(VaultMarkdown(rel_path, root))
+    entries: list[tuple[PurePosixPath, bool]] = []
+    for rel in sorted(_scan_files(str(root), "")):
+        _LOGGER.info("Processing file: %s", rel)
+        entries.append((PurePosixPath(rel), rel.lower().endswith(".md")))
+
+    markdown_paths = [rel_path for rel_path, is_markdown in entries if is_markdown]
+    global _FM_CACHE
+    _FM_CACHE = _load_fm_cache(root)
+    cache_entries: dict[str, _FmCacheEntry] = {}
+    try:
+        if len(markdown_paths) < _MIN_PARALLEL_LOAD:
+            markdowns = (VaultMarkdown(rel_path, root) for rel_path in markdown_paths)
         else:
-            files.append(VaultOther(rel_path))
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                markdowns = iter(
+                    list(executor.map(VaultMarkdown, markdown_paths, repeat(root)))
+                )
+        for rel_path, is_markdown in entries:
+            if is_markdown:
+                markdown = next(markdowns)
+                cache_entries[markdown._posix] = (
+                    markdown._stat_key,
+                    markdown._meta,
+                    markdown._body_offset,
+                )
+                yield markdown
+            else:
+                yield VaultOther(rel_path)
+    finally:
+        _FM_CACHE = None
+    if cache_entries:
+        _store_fm_cache(root, cache_entries)
+    _LOGGER.info("Discovered %d files", len(entries))
+
 
-    _LOGGER.info("Discovered %d files", len(files))
-    return files
+def load_vault(directory: Path | str) -> list[VaultFile]:
+    return list(iter_vault(directory))
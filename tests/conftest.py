@@ -5,6 +5,7 @@ import yaml
 import pytest
 
 _DEFAULT_FRONT_MATTER = object()
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 _DEFAULT_DATES = {
     "date created": "2024-01-01",
     "date modified": "2024-01-02",
@@ -13,6 +14,33 @@ _DEFAULT_DATES = {
 WriteMarkdown = Callable[[Path, str, str, object | None], Path]
 
 
+def _quote_scalar(value: object) -> str:
+    # Single-quote strings so YAML reads them back as strings; left bare,
+    # date- or number-shaped strings would come back as richer types.
+    if isinstance(value, str):
+        escaped = value.replace("'", "''")
+        return f"'{escaped}'"
+    return str(value)
+
+
+def _dump_front_matter(front_matter: object) -> str:
+    # Test front matter is flat dicts of strings/bools/lists, so a direct
+    # f-string rendering skips the PyYAML emitter on every fixture call.
+    # Anything else (e.g. invalid-front-matter cases) goes through yaml.
+    if not isinstance(front_matter, dict):
+        return yaml.dump(front_matter, Dumper=_YAML_DUMPER, sort_keys=False).strip()
+    lines: list[str] = []
+    for key, value in front_matter.items():
+        if isinstance(value, bool):
+            lines.append(f"{key}: {'true' if value else 'false'}")
+        elif isinstance(value, list):
+            lines.append(f"{key}:")
+            lines.extend(f"- {_quote_scalar(item)}" for item in value)
+        else:
+            lines.append(f"{key}: {_quote_scalar(value)}")
+    return "\n".join(lines)
+
+
 @pytest.fixture
 def write_markdown() -> WriteMarkdown:
     def _write_markdown(
@@ -28,8 +56,7 @@ def write_markdown() -> WriteMarkdown:
         if front_matter is None:
             content = body
         else:
-            rendered = yaml.safe_dump(front_matter, sort_keys=False).strip()
-            content = f"---\n{rendered}\n---\n{body}"
+            content = f"---\n{_dump_front_matter(front_matter)}\n---\n{body}"
         path.write_text(content, encoding="utf-8")
         return path
 
@@ -188,6 +188,63 @@ def test_render_markdown_strips_percent_comments(
     assert "Done" in note.html
 
 
+def test_render_markdown_parallel_batch(
+    tmp_path: Path, write_markdown: WriteMarkdown
+) -> None:
+    root = tmp_path
+    for index in range(6):
+        write_markdown(
+            root,
+            f"notes/Post {index}.md",
+            f"See ![Alt](assets/image.png) in post {index}.\n",
+            _DEFAULT_FRONT_MATTER,
+        )
+    image_path = root / "assets/image.png"
+    image_path.parent.mkdir(parents=True, exist_ok=True)
+    image_path.write_bytes(b"\x89PNG")
+
+    files = load_vault(root)
+    render_markdown(files, TemplateRenderer("Test Site"))
+
+    for index in range(6):
+        note = _get_markdown(files, f"notes/Post {index}.md")
+        assert note.html is not None
+        assert 'src="/assets/image.png"' in note.html
+    image = next(file for file in files if isinstance(file, VaultOther))
+    assert image.targeted is True
+
+
+def test_render_markdown_reuses_cache(
+    tmp_path: Path, write_markdown: WriteMarkdown
+) -> None:
+    root = tmp_path / "vault"
+    cache_dir = tmp_path / "cache"
+    root.mkdir()
+    write_markdown(
+        root,
+        "notes/Cached Post.md",
+        "![Alt](assets/image.png)\n",
+        _DEFAULT_FRONT_MATTER,
+    )
+    image_path = root / "assets/image.png"
+    image_path.parent.mkdir(parents=True, exist_ok=True)
+    image_path.write_bytes(b"\x89PNG")
+
+    files = load_vault(root)
+    render_markdown(files, TemplateRenderer("Test Site"), cache_dir=cache_dir)
+    first_html = _get_markdown(files, "notes/Cached Post.md").html
+    assert first_html is not None
+    assert any(cache_dir.rglob("*.json"))
+
+    reloaded = load_vault(root)
+    render_markdown(reloaded, TemplateRenderer("Test Site"), cache_dir=cache_dir)
+
+    cached_note = _get_markdown(reloaded, "notes/Cached Post.md")
+    cached_image = next(file for file in reloaded if isinstance(file, VaultOther))
+    assert cached_note.html == first_html
+    assert cached_image.targeted is True
+
+
 def test_render_markdown_hides_created_date_with_tag(
     tmp_path: Path, write_markdown: WriteMarkdown
 ) -> None:
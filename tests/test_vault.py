@@ -242,6 +242,34 @@ def test_load_vault_builds_file_types(tmp_path: Path) -> None:
     assert any(item.path == PurePosixPath("assets/image.png") for item in files)
 
 
+def test_load_vault_reuses_front_matter_cache(
+    tmp_path: Path, write_markdown: WriteMarkdown
+) -> None:
+    root = tmp_path
+    write_markdown(
+        root,
+        "notes/post.md",
+        "# Post\n",
+        {
+            "publish": True,
+            "date created": "2024-01-01",
+            "date modified": "2024-01-02",
+        },
+    )
+
+    first = load_vault(root)
+    assert (root / ".soggy-cache" / "front-matter.pickle").is_file()
+
+    second = load_vault(root)
+
+    first_post = next(item for item in first if isinstance(item, VaultMarkdown))
+    second_post = next(item for item in second if isinstance(item, VaultMarkdown))
+    assert second_post.publish is first_post.publish
+    assert second_post.date_created == first_post.date_created
+    assert second_post.date_updated == first_post.date_updated
+    assert second_post.content == first_post.content
+
+
 def test_vault_markdown_write_out(
     tmp_path: Path, write_markdown: WriteMarkdown
 ) -> None: